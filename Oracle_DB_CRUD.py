@@ -1,13 +1,131 @@
 # -*- coding: utf-8 -*-
 
-import oracledb
+import logging
+import re
+from contextlib import contextmanager
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"[A-Za-z][A-Za-z0-9_$#]*")
+_CONSTRAINTS = r"(?:\s+(?:NOT\s+NULL|NULL|PRIMARY\s+KEY|UNIQUE))*"
+_COLUMN_TYPE = re.compile(
+    r"(?:INT|INTEGER|FLOAT|DATE|CLOB|BLOB"
+    r"|NUMBER(?:\s*\(\s*\d+\s*(?:,\s*-?\d+\s*)?\))?"
+    r"|N?VARCHAR2\s*\(\s*\d+(?:\s+(?:BYTE|CHAR))?\s*\)"
+    r"|N?CHAR(?:\s*\(\s*\d+(?:\s+(?:BYTE|CHAR))?\s*\))?"
+    r"|TIMESTAMP(?:\s*\(\s*\d\s*\))?)"
+    + _CONSTRAINTS,
+    re.IGNORECASE,
+)
+
+def _validate_identifier(name):
+    """
+    Returns the given table or column name if it is a plain Oracle identifier, so that it can be safely placed in SQL text.
+    Raises ValueError otherwise.
+    """
+    if not _IDENTIFIER.fullmatch(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return name
+
+def _validate_type(column_type):
+    """
+    Returns the given column datatype if it is one of the supported Oracle datatypes
+    (INT, NUMBER(p,s), VARCHAR2(n), CHAR(n), DATE, TIMESTAMP, CLOB, BLOB), optionally followed by NOT NULL / PRIMARY KEY / UNIQUE.
+    Raises ValueError otherwise.
+    """
+    if not _COLUMN_TYPE.fullmatch(column_type.strip()):
+        raise ValueError(f"Invalid column datatype: {column_type!r}")
+    return column_type.strip()
+
+def _create_table_sql(table_name, columns_dict):
+    """
+    Returns the CREATE TABLE statement for the given table name and dictionary of column names and datatypes.
+    Raises ValueError if a name or datatype is not valid.
+    """
+    cols = ", ".join(f"{_validate_identifier(column_name)} {_validate_type(column_type)}"
+                     for column_name, column_type in columns_dict.items())
+    return f"CREATE TABLE {_validate_identifier(table_name).upper()} ({cols})"
+
+def _drop_table_sql(table_name, purge=True):
+    """
+    Returns the DROP TABLE statement for the given table name, with PURGE unless purge is False.
+    Raises ValueError if the name is not valid.
+    """
+    query = f"DROP TABLE {_validate_identifier(table_name).upper()}"
+    return query + " PURGE" if purge else query
+
+def _insert_sql(table_name, columns):
+    """
+    Returns the INSERT statement for the given table name and column names, with one positional bind per column.
+    Raises ValueError if a name is not valid.
+    """
+    col_str = ', '.join(_validate_identifier(column) for column in columns)
+    value_str = ', '.join([f':{i+1}' for i in range(len(columns))])
+    return f"INSERT INTO {_validate_identifier(table_name).upper()}({col_str}) VALUES({value_str})"
+
+def _duplicates_sql(table_name, column_name):
+    """
+    Returns the query counting up to two rows of the given table whose column equals the bound value.
+    Raises ValueError if a name is not valid.
+    """
+    return (f"SELECT COUNT(*) FROM {_validate_identifier(table_name).upper()} "
+            f"WHERE {_validate_identifier(column_name)} = :1 AND ROWNUM <= 2")
+
+def _bind_type(value):
+    """
+    Returns the bind type used to pre-allocate the bind buffer for a column, based on a sample value.
+    None lets oracledb infer the type.
+    """
+    import oracledb
+    if isinstance(value, datetime):
+        return oracledb.DB_TYPE_DATE
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return oracledb.DB_TYPE_NUMBER
+    return None
+
+_SIZED_STRING_TYPE = re.compile(r"(?:N?VARCHAR2|N?CHAR)\s*\(\s*(\d+)(?:\s+(?:BYTE|CHAR))?\s*\)" + _CONSTRAINTS, re.IGNORECASE)
+# Exact datatype forms with a known bind type; any other form, e.g. TIMESTAMP WITH TIME ZONE, is left to oracledb
+_TYPE_MAP = (
+    (re.compile(r"(?:INT|INTEGER|FLOAT|NUMBER(?:\s*\(\s*\d+\s*(?:,\s*-?\d+\s*)?\))?)" + _CONSTRAINTS, re.IGNORECASE),
+     "DB_TYPE_NUMBER"),
+    (re.compile(r"DATE" + _CONSTRAINTS, re.IGNORECASE), "DB_TYPE_DATE"),
+    (re.compile(r"TIMESTAMP(?:\s*\(\s*\d\s*\))?" + _CONSTRAINTS, re.IGNORECASE), "DB_TYPE_TIMESTAMP"),
+    # Bound as LONG / LONG RAW so str and bytes values go inline instead of through a temporary LOB per row
+    (re.compile(r"CLOB" + _CONSTRAINTS, re.IGNORECASE), "DB_TYPE_LONG"),
+    (re.compile(r"BLOB" + _CONSTRAINTS, re.IGNORECASE), "DB_TYPE_LONG_RAW"),
+)
+
+def _input_size(column_type):
+    """
+    Returns the bind type or size for a column declared with the given SQL datatype, e.g. DATE or VARCHAR2(50).
+    None lets oracledb infer the type.
+    """
+    import oracledb
+    column_type = column_type.strip()
+    match = _SIZED_STRING_TYPE.fullmatch(column_type)
+    if match:
+        return int(match.group(1))
+    for pattern, db_type in _TYPE_MAP:
+        if pattern.fullmatch(column_type):
+            return getattr(oracledb, db_type)
+    return None
+
+VALID_DRIVES = frozenset(f"drive_{i}" for i in range(1, 7))
+# Expected type, allowed values and position name of each upload_log input
+_UPLOAD_LOG_SCHEMA = (
+    (str, None, "First"),
+    (datetime, None, "Second"),
+    (str, VALID_DRIVES, "Third"),
+    (str, None, "Fourth"),
+)
+_TYPE_NAMES = {str: "string", datetime: "datetime"}
+
 class OracleSQL:
     """
     OracleSQL is a class for interacting with Oracle databases using Python.
     """
-    def __init__(self, username, password, host, port, service):
+    def __init__(self, username, password, host, port, service, pool_min=2, pool_max=10, pool_increment=1):
         """
         Initializes OracleSQL class instance with the required connection details
         
@@ -17,55 +135,103 @@ class OracleSQL:
         host: str, host name of the Oracle Database server
         port: str, port number of the Oracle Database server
         service: str, name of the service to connect to
+        pool_min: int, number of connections opened when the pool is created
+        pool_max: int, maximum number of connections the pool can hold
+        pool_increment: int, number of connections opened whenever the pool needs to grow
         """
         self.username = username
         self.password = password
         self.host = host
         self.port = port
         self.service = service
-        self.connection = None
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.pool_increment = pool_increment
+        self.pool = None
+        self.autocommit = False
+        self._tables_cache = set()
+        self._table_schemas = {}
     
     def connect(self):
         """
-        Connects to Oracle Database with the details provided in the constructor using the oracledb module.
+        Creates a connection pool to Oracle Database with the details provided in the constructor using the oracledb module.
+        oracledb runs in Thin mode, so no Oracle Instant Client install is needed.
+        The oracledb module is imported on first use rather than when this module is imported.
         """
+        import oracledb
         try:
             dsn_string = f"{self.host}:{self.port}/{self.service}"
-            oracledb.init_oracle_client(lib_dir=r"C:\Users\susanth\Downloads\instantclient_19_17")
-            self.connection = oracledb.connect(user=self.username, password=self.password, dsn=dsn_string)
-            print("Connected to Oracle Database")
+            self.pool = oracledb.create_pool(user=self.username, password=self.password, dsn=dsn_string,
+                                             min=self.pool_min, max=self.pool_max, increment=self.pool_increment)
+            log.info("Connected to Oracle Database")
         except oracledb.DatabaseError as e:
             error, = e.args
-            print("Error code:", error.code)
-            print("Error message:", error.message)
+            log.exception("Error code: %s, error message: %s", error.code, error.message)
     
     def close(self):
         """
-        Closes the connection to Oracle Database.
+        Closes the connection pool to Oracle Database.
         """
+        import oracledb
         try:
-            self.connection.close()
-            print("Connection closed")
+            self.pool.close()
+            log.info("Connection closed")
         except oracledb.DatabaseError as e:
             error, = e.args
-            print("Error code:", error.code)
-            print("Error message:", error.message)
+            log.exception("Error code: %s, error message: %s", error.code, error.message)
     
-    def check_table_exists(self, table_name):
+    def set_autocommit(self, on):
+        """
+        Turns autocommit on or off for the connections used by this instance.
+        With autocommit on, each statement is committed as part of its own round-trip instead of a separate commit call.
+        
+        Args:
+        on: bool, True to commit every statement automatically, False to commit explicitly
+        """
+        self.autocommit = on
+    
+    @contextmanager
+    def _acquire(self):
+        """
+        Acquires a connection from the pool and releases it back to the pool on exit.
+        The autocommit setting of the instance is applied to the connection on every acquire.
+        """
+        conn = self.pool.acquire()
+        conn.autocommit = self.autocommit
+        try:
+            yield conn
+        finally:
+            self.pool.release(conn)
+    
+    def check_table_exists(self, table_name, owner=None):
         """
         Checks if a table exists in the database.
+        Tables of the connected user's schema found to exist are cached; create_table and delete_table keep the cache up to date.
+        Lookups with an owner always query the database, since tables of other schemas are not managed through this instance.
         
         Args:
         table_name: str, name of the table to check
+        owner: str, optional schema that owns the table. Defaults to the schema of the connected user.
         
         Returns:
         bool, True if the table exists, False otherwise.
         """
-        cur = self.connection.cursor() 
-        cur.execute(f"SELECT COUNT(*) FROM all_tables WHERE table_name = '{table_name.upper()}'")
-        if cur.fetchone()[0] != 0:
+        table_name = table_name.upper()
+        if not owner and table_name in self._tables_cache:
+            return True
+        with self._acquire() as conn, conn.cursor() as cur:
+            cur.prefetchrows = 2
+            cur.arraysize = 2
+            if owner:
+                cur.execute("SELECT 1 FROM all_tables WHERE owner = :1 AND table_name = :2 AND ROWNUM = 1",
+                            [owner.upper(), table_name])
+            else:
+                cur.execute("SELECT 1 FROM user_tables WHERE table_name = :1 AND ROWNUM = 1", [table_name])
+            if cur.fetchone() is None:
+                return False
+            if not owner:
+                self._tables_cache.add(table_name)
             return True
-        cur.close()
             
     def create_table(self, table_name, columns_dict):
         """
@@ -74,100 +240,151 @@ class OracleSQL:
         Args:
         table_name: str, name of the table to create
         columns_dict: dict, a dictionary containing the names and datatypes of the columns.
+        
+        Raises:
+        ValueError, if the table name, a column name or a column datatype is not valid.
         """
+        import oracledb
+        sql_query = _create_table_sql(table_name, columns_dict)
         if not self.check_table_exists(table_name):
-            try:
-                    cur = self.connection.cursor()
-                    sql_query = f"CREATE TABLE {table_name.upper()} ("
-                    for column_name, column_type in columns_dict.items():
-                        sql_query += f"{column_name} {column_type},"
-                    sql_query = sql_query[:-1] + ")"
+            with self._acquire() as conn, conn.cursor() as cur:
+                try:
                     cur.execute(sql_query)
-                    self.connection.commit()
-                    print(f"Table {table_name.upper()} created successfully")
-            except oracledb.DatabaseError as e:
-                error, = e.args
-                print("Error code:", error.code)
-                print("Error message:", error.message)
-            finally:
-                cur.close()
+                    self._tables_cache.add(table_name.upper())
+                    self._table_schemas[table_name.upper()] = {name.upper(): datatype for name, datatype in columns_dict.items()}
+                    log.info("Table %s created successfully", table_name.upper())
+                except oracledb.DatabaseError as e:
+                    error, = e.args
+                    log.exception("Error code: %s, error message: %s", error.code, error.message)
         else:
-            print(f"Table {table_name.upper()} already exists")
+            log.warning("Table %s already exists", table_name.upper())
     
-    def delete_table(self, table_name):
+    def delete_table(self, table_name, purge=True):
         """
         Delete a table from the database.
 
         Args:
         - table_name: str, name of the table to be deleted
+        - purge: bool, drop the table immediately instead of moving it to the recycle bin
 
         Returns:
         - None
+
+        Raises:
+        - ValueError: if the table name is not a valid identifier
         """
+        import oracledb
+        query = _drop_table_sql(table_name, purge)
         if self.check_table_exists(table_name):
-            try:
-                cur = self.connection.cursor()
-                query = f"DROP TABLE {table_name.upper()}"
-                cur.execute(query)
-                self.connection.commit()
-                cur.close()
-                print(f"Table {table_name.upper()} deleted successfully")
-            except oracledb.Error as e:
-                self.connection.rollback()
-                print("Error occured: ", e)
+            with self._acquire() as conn, conn.cursor() as cur:
+                try:
+                    cur.execute(query)
+                    self._tables_cache.discard(table_name.upper())
+                    self._table_schemas.pop(table_name.upper(), None)
+                    log.info("Table %s deleted successfully", table_name.upper())
+                except oracledb.Error:
+                    conn.rollback()
+                    log.exception("Error occured")
         else:
-            print(f"Table {table_name.upper()} does not exist")
+            log.warning("Table %s does not exist", table_name.upper())
         
-    def insert_into_table(self, table_name, values_dic):
+    def insert_into_table(self, table_name, rows, batch_size=1000, column_types=None):
         """
-        Insert a record into the database.
+        Insert one or more records into the database in batches.
 
         Args:
-        - table_name: str, name of the table to insert the record into
-        - values_dic: dict, dictionary containing column names and their corresponding values
+        - table_name: str, name of the table to insert the records into
+        - rows: list, list of dictionaries with identical column names as keys and their corresponding values.
+          A single dictionary is accepted as one record.
+        - batch_size: int, number of records sent to the database per executemany call
+        - column_types: dict, optional dictionary of column names and datatypes, as passed to create_table.
+          Defaults to the schema of tables created through this instance; used to set the bind types once per insert.
 
         Returns:
         - None
+
+        Raises:
+        - ValueError: if the table name or a column name is not a valid identifier, or batch_size is below 1
         """
+        import oracledb
+        if isinstance(rows, dict):
+            rows = [rows]
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size!r}")
+        if not rows:
+            log.warning("No records to insert")
+            return
+        columns = list(rows[0].keys())
+        query = _insert_sql(table_name, columns)
         if self.check_table_exists(table_name):
-            try:
-                cur = self.connection.cursor()
-                col_str = ', '.join(values_dic.keys())
-                value_str = ', '.join([f':{i+1}' for i in range(len(values_dic))])
-                query = f"INSERT INTO {table_name.upper()}({col_str}) VALUES({value_str})"
-                cur.execute(query, list(values_dic.values()))
-                self.connection.commit()
-                cur.close()
-                print("Record inserted successfully")
-            except oracledb.Error as e:
-                self.connection.rollback()
-                print("Error occured: ", e)
+            with self._acquire() as conn, conn.cursor() as cur:
+                try:
+                    if column_types is None:
+                        column_types = self._table_schemas.get(table_name.upper(), {})
+                    column_types = {name.upper(): datatype for name, datatype in column_types.items()}
+                    cur.setinputsizes(*[_input_size(column_types[column.upper()]) if column.upper() in column_types
+                                        else _bind_type(rows[0][column]) for column in columns])
+                    if len(rows) == 1:
+                        conn.autocommit = True
+                        try:
+                            cur.execute(query, [rows[0][column] for column in columns])
+                        finally:
+                            conn.autocommit = self.autocommit
+                    else:
+                        # All batches form one transaction, so a failed batch rolls back the earlier ones
+                        conn.autocommit = False
+                        try:
+                            for start in range(0, len(rows), batch_size):
+                                batch = rows[start:start + batch_size]
+                                cur.executemany(query, [[row[column] for column in columns] for row in batch])
+                            conn.commit()
+                        finally:
+                            conn.autocommit = self.autocommit
+                    log.info("%s record(s) inserted successfully", len(rows))
+                except oracledb.Error:
+                    conn.rollback()
+                    log.exception("Error occured")
         else:
-            print(f"Table {table_name.upper()} does not exist")
+            log.warning("Table %s does not exist", table_name.upper())
     
-    def call_procedure(self, procedure_name, procedure_inputs):
+    def call_procedure(self, procedure_name, procedure_inputs, arraysize=None):
         """
         Call a stored procedure in the database.
 
         Args:
         - procedure_name: str, name of the stored procedure to be called
         - procedure_inputs: list, list of inputs to be passed to the stored procedure
+        - arraysize: int, optional number of rows fetched per round-trip from REF CURSOR arguments,
+          e.g. 500 - 1000 for procedures returning many rows
 
         Returns:
-        - procedure_return: obj, the return value of the stored procedure
+        - procedure_return: list, the procedure arguments after the call including OUT values, with REF CURSOR
+          arguments fetched into lists of rows, or None if the call failed
         """
-        cur = self.connection.cursor()
-        try:
-            cur.callproc(procedure_name, procedure_inputs)
-            self.connection.commit()
-            procedure_return = cur.fetchall()
-        except oracledb.DatabaseError as e:
-            error, = e.args
-            print("Error code:", error.code)
-            print("Error message:", error.message)
-        finally:
-            cur.close()
-            return procedure_return
+        import oracledb
+        procedure_return = None
+        with self._acquire() as conn, conn.cursor() as cur:
+            try:
+                procedure_args = cur.callproc(procedure_name, procedure_inputs)
+                # REF CURSOR arguments are read while the connection is still held from the pool
+                procedure_return = [self._fetch_ref_cursor(value, arraysize) if isinstance(value, oracledb.Cursor) else value
+                                    for value in procedure_args]
+                if not conn.autocommit:
+                    conn.commit()
+            except oracledb.Error as e:
+                error, = e.args
+                log.exception("Error code: %s, error message: %s", error.code, error.message)
+        return procedure_return
+        
+    @staticmethod
+    def _fetch_ref_cursor(ref_cursor, arraysize=None):
+        """
+        Fetches all rows of a REF CURSOR returned by a stored procedure and closes it.
+        """
+        with ref_cursor:
+            if arraysize is not None:
+                ref_cursor.arraysize = arraysize
+            return ref_cursor.fetchall()
         
     def upload_log(self, procedure_name, procedure_inputs):
         """
@@ -180,19 +397,14 @@ class OracleSQL:
         Returns:
         - str: a string describing the result of the stored procedure call
         """
-        valid_values = ["drive_1", "drive_2", "drive_3", "drive_4", "drive_5", "drive_6"]
-        if not isinstance(procedure_inputs[0], str):
-            return "Invalid input: First input must be string"
-        elif not isinstance(procedure_inputs[1], datetime.datetime):
-            return "Invalid input: Second input must be datetime"
-        elif not isinstance(procedure_inputs[2], str):
-            return "Invalid input: Third input must be string"
-        elif not procedure_inputs[2] in valid_values:
-            return "Invalid input: Third input must be a string of value drive_1 / 2 / 3 / 4 / 5 / 6"
-        elif not isinstance(procedure_inputs[3], str):
-            return "Invalid input: Fourth input must be string"
-        else:
-            return self.call_procedure(procedure_name, procedure_inputs)        
+        if len(procedure_inputs) != len(_UPLOAD_LOG_SCHEMA):
+            return f"Invalid input: {len(_UPLOAD_LOG_SCHEMA)} inputs expected"
+        for value, (cls, allowed, position) in zip(procedure_inputs, _UPLOAD_LOG_SCHEMA):
+            if not isinstance(value, cls):
+                return f"Invalid input: {position} input must be {_TYPE_NAMES[cls]}"
+            if allowed and value not in allowed:
+                return f"Invalid input: {position} input must be a string of value drive_1 / 2 / 3 / 4 / 5 / 6"
+        return self.call_procedure(procedure_name, procedure_inputs)
 
     def check_duplicates(self, table_name, column_name, value):
         """
@@ -205,37 +417,60 @@ class OracleSQL:
 
         Returns:
         - bool: True if there are duplicates, False otherwise
+
+        Raises:
+        - ValueError: if the table or column name is not a valid identifier
         """
-        cur = self.connection.cursor()
-        try:
-            query = f"SELECT {column_name}, COUNT(*) FROM {table_name.upper()} WHERE {column_name} = :value GROUP BY {column_name} HAVING COUNT(*) > 1"
-            cur.execute(query, value=value)
-            cur.fetchall()
-            if cur.rowcount > 0:
-                return True
-            else:
+        import oracledb
+        query = _duplicates_sql(table_name, column_name)
+        with self._acquire() as conn, conn.cursor() as cur:
+            try:
+                cur.prefetchrows = 2
+                cur.arraysize = 2
+                cur.execute(query, [value])
+                return cur.fetchone()[0] > 1
+            except oracledb.Error:
+                log.exception("There was an error")
                 return False
-        except oracledb.Error as e:
-            print("There was an error:", e)
-            return False
-        finally:
-            cur.close()
-
-username=
-userpwd = 
-host = 
-port = 
-service_name = 
-
-oracle = OracleSQL(username, userpwd, host, port,service_name)
-columns_dic = {"id": "INT", "date_time": "DATE"}
-oracle.connect()
-oracle.create_table("example_table", columns_dic)
-now = datetime.now()
-values_dic = {"id": 1, "date_time": now}
-oracle.insert_into_table("example_table", values_dic)
-oracle.check_duplicates("example_table", "id", 1)
-oracle.delete_table("example_table")
-oracle.close()
+
+if __name__ == "__main__":
+    import oracledb
+
+    logging.basicConfig(level=logging.INFO)
+
+    username=
+    userpwd = 
+    host = 
+    port = 
+    service_name = 
+
+    oracle = OracleSQL(username, userpwd, host, port,service_name)
+    table_name = "example_table"
+    columns_dic = {"id": "INT", "date_time": "DATE"}
+    oracle.connect()
+    now = datetime.now()
+    values_dic = {"id": 1, "date_time": now}
+    try:
+        if oracle.check_table_exists(table_name):
+            log.warning("Table %s already exists", table_name.upper())
+        elif hasattr(oracledb.Connection, "run_pipeline"):
+            # Queue every statement and send them to the database in a single round-trip
+            pipeline = oracledb.create_pipeline()
+            pipeline.add_execute(_create_table_sql(table_name, columns_dic))
+            pipeline.add_execute(_insert_sql(table_name, list(values_dic)), list(values_dic.values()))
+            pipeline.add_commit()
+            duplicates_op = len(pipeline.operations)
+            pipeline.add_fetchone(_duplicates_sql(table_name, "id"), [values_dic["id"]])
+            pipeline.add_execute(_drop_table_sql(table_name))
+            with oracle.pool.acquire() as connection:
+                results = connection.run_pipeline(pipeline)
+            log.info("Duplicates found: %s", results[duplicates_op].rows[0][0] > 1)
+        else:
+            oracle.create_table(table_name, columns_dic)
+            oracle.insert_into_table(table_name, [values_dic])
+            log.info("Duplicates found: %s", oracle.check_duplicates(table_name, "id", values_dic["id"]))
+            oracle.delete_table(table_name)
+    finally:
+        oracle.close()
 
     